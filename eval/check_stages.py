@@ -0,0 +1,317 @@
+from __future__ import annotations
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+
+import eval as ev
+from prompts import DEFAULT_JUDGE_SYSTEM_PROMPT
+from rejudge import rejudge_target
+
+# Offline check of the answer/judge stages with a stub client (no API keys needed):
+#   python check_stages.py
+
+
+class StubClient:
+    """
+    Answers echo the question (or are the fixed `answer`); judge "judge-yes" always says YES,
+    any other judge says NO. Counts calls per model and records the judge prompts it was sent;
+    delay simulates request latency, fail_on makes judge requests containing that text fail.
+    """
+
+    def __init__(self, delay: float = 0.0, answer: str | None = None, fail_on: str | None = None):
+        self.calls = Counter()
+        self.judged: list[str] = []
+        self.delay = delay
+        self.answer = answer
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def chat(self, model: str, messages: list[dict], temperature: float = 0.0, max_tokens: int = 256) -> str:
+        with self._lock:
+            self.calls[model] += 1
+        time.sleep(self.delay)
+        content = messages[-1]["content"]
+        if messages[0]["role"] == "system":
+            if self.fail_on and self.fail_on in content:
+                raise RuntimeError("stub judge failure")
+            with self._lock:
+                self.judged.append(content)
+            return "YES" if model == "judge-yes" else "NO"
+        return self.answer if self.answer is not None else f"answer: {content}"
+
+
+def _dataset(n: int) -> pd.DataFrame:
+    rows = []
+    for i in range(n):
+        for lang in ("en", "fr"):
+            rows.append({
+                "q_id": str(i), "original_lang": "en", "language": lang,
+                "question": f"{lang} question {i}", "content": f"{lang} context {i}",
+            })
+    return pd.DataFrame(rows)
+
+
+def _write_legacy(outdir: Path, df: pd.DataFrame, n: int) -> None:
+    # Pre-split layout: untagged answers + verdicts (produced by judge "judge-yes") for the first n q_ids
+    pairs = ev.build_pairs(df, "en", "fr").head(n)
+    pd.DataFrame({
+        "q_id": pairs["q_id"], "q_src": pairs["q_src"], "a_src": "legacy src", "correct_source": True,
+    }).to_csv(outdir / "en_source_answers.csv", index=False, encoding="utf-8-sig")
+    pd.DataFrame({
+        "q_id": pairs["q_id"], "source_lang": "en", "target_lang": "fr",
+        "q_src": pairs["q_src"], "q_tgt": pairs["q_tgt"], "a_src": "legacy src", "a_tgt": "legacy tgt",
+        "correct_source": True, "correct_target": True,
+    }).to_csv(outdir / "fr_predictions.csv", index=False, encoding="utf-8-sig")
+
+
+def _numeric_looking_prompt() -> str:
+    # A judge prompt whose id pandas would parse as a number if tags were not read as str
+    i = 0
+    while True:
+        text = f"{DEFAULT_JUDGE_SYSTEM_PROMPT} ({i})"
+        if hashlib.sha1(text.encode("utf-8")).hexdigest()[:8].isdigit():
+            return text
+        i += 1
+
+
+def check_legacy_migration_and_rejudge(tmp: Path) -> None:
+    df = _dataset(6)
+    _write_legacy(tmp, df, n=4)
+
+    client = StubClient()
+    preds = ev.run_pairwise_eval(
+        df, "en", "fr", tested_model="tested", judge_model="judge-yes",
+        temperature=0.0, max_tokens=16, outdir=str(tmp), client=client,
+    )
+    # Only the 2 new q_ids are answered (src + tgt) and judged (src + tgt); legacy verdicts are kept.
+    assert client.calls == Counter({"tested": 4, "judge-yes": 4}), client.calls
+    assert len(preds) == 6 and preds["correct_source"].all() and preds["correct_target"].all()
+    src_j = pd.read_csv(tmp / "en_source_judgments.csv", dtype=str)
+    assert set(src_j["q_id"]) == {str(i) for i in range(6)}, "legacy source verdicts lost"
+    assert set(src_j["judge_model"]) == {"judge-yes"}
+    print("[ok] legacy artifacts migrated for the judge that produced them")
+
+    # Another judge must judge every stored answer and never inherit the legacy verdicts.
+    client = StubClient()
+    metrics, preds_path, _ = rejudge_target(
+        df=df, artifacts_dir=str(tmp), source="en", target="fr", tested_model="tested",
+        judge_model="judge-no", judge_prompt=None, workers=4, batch_size=5, client=client,
+    )
+    assert client.calls == Counter({"judge-no": 12}), client.calls
+    out = pd.read_csv(preds_path, dtype=str)
+    assert set(out["judge_model"]) == {"judge-no"} and (out["correct_source"] == "False").all()
+    assert metrics["overall_success"] == 0.0
+    print("[ok] rejudge with another judge calls the judge for every answer")
+
+
+def check_rejudge_untouched_legacy_dir(tmp: Path) -> None:
+    # rejudge on a never-migrated dir adopts answers only, never the untagged verdicts
+    df = _dataset(3)
+    _write_legacy(tmp, df, n=3)
+    client = StubClient()
+    out = rejudge_target(
+        df=df, artifacts_dir=str(tmp), source="en", target="fr", tested_model="tested",
+        judge_model="judge-no", judge_prompt=None, workers=2, batch_size=2, client=client,
+    )
+    assert out is not None and client.calls == Counter({"judge-no": 6}), client.calls
+    assert "correct_source" in pd.read_csv(tmp / "en_source_answers.csv").columns, "legacy file was rewritten"
+    print("[ok] rejudge on a legacy dir leaves legacy verdicts alone")
+
+
+def check_numeric_prompt_id(tmp: Path) -> None:
+    df = _dataset(3)
+    prompt = _numeric_looking_prompt()
+    ev.run_answer_stage(df, "en", "fr", "tested", 0.0, 16, str(tmp), client=StubClient())
+    answers = ev.load_answers(str(tmp), "en", "fr", "tested")
+
+    for expected_calls in (6, 0):
+        ev._TABLE_CACHE.clear()  # behave like a fresh process
+        client = StubClient()
+        preds = ev.run_judge_stage(
+            df, answers, "en", "fr", "tested", "judge-yes", str(tmp),
+            judge_prompt=prompt, workers=2, batch_size=4, client=client,
+        )
+        assert sum(client.calls.values()) == expected_calls, client.calls
+        assert len(preds) == 3
+    j = pd.read_csv(tmp / "fr_judgments.csv", dtype=str)
+    assert len(j) == 3, "duplicate judgments"
+    print("[ok] numeric-looking judge prompt ids are reused from disk")
+
+
+def check_same_language(tmp: Path) -> None:
+    df = _dataset(3)
+    client = StubClient()
+    preds = ev.run_pairwise_eval(
+        df, "en", "en", tested_model="tested", judge_model="judge-yes",
+        temperature=0.0, max_tokens=16, outdir=str(tmp), client=client,
+    )
+    # One answer and one verdict per q_id; the target side reuses both.
+    assert client.calls == Counter({"tested": 3, "judge-yes": 3}), client.calls
+    assert (preds["a_src"] == preds["a_tgt"]).all()
+    assert (preds["correct_source"] == preds["correct_target"]).all()
+    print("[ok] same-language eval reuses source answers and verdicts")
+
+
+def check_answers_keyed_by_source(tmp: Path) -> None:
+    # An answer stored for another source language must not mark the q_id as done.
+    df = _dataset(2)
+    pd.DataFrame([{
+        "q_id": "0", "source_lang": "de", "target_lang": "fr", "tested_model": "tested",
+        "q_src": "x", "q_tgt": "y", "a_src": "x", "a_tgt": "y",
+    }]).to_csv(tmp / "fr_answers.csv", index=False, encoding="utf-8-sig")
+    client = StubClient()
+    answers = ev.run_answer_stage(df, "en", "fr", "tested", 0.0, 16, str(tmp), client=client)
+    assert set(answers["q_id"]) == {"0", "1"}, answers
+    assert len(pd.read_csv(tmp / "fr_answers.csv")) == 3
+    print("[ok] target answers are keyed by source language")
+
+
+def check_na_like_answer_rejudged(tmp: Path) -> None:
+    # An answer of "None" must reach the judge verbatim after a reload from disk, not as "nan".
+    df = _dataset(2)
+    ev.run_answer_stage(df, "en", "fr", "tested", 0.0, 16, str(tmp), client=StubClient(answer="None"))
+    ev._TABLE_CACHE.clear()  # behave like a fresh process
+    client = StubClient()
+    _, preds_path, _ = rejudge_target(
+        df=df, artifacts_dir=str(tmp), source="en", target="fr", tested_model="tested",
+        judge_model="judge-no", judge_prompt=None, workers=2, batch_size=4, client=client,
+    )
+    assert len(client.judged) == 4 and all("ANSWER:\nNone\n" in m for m in client.judged), client.judged
+    out = pd.read_csv(preds_path, dtype=str, keep_default_na=False)
+    assert (out["a_src"] == "None").all() and (out["a_tgt"] == "None").all(), out
+    print("[ok] NA-like answers are judged verbatim after a reload")
+
+
+def check_failed_judge_keeps_batch(tmp: Path) -> None:
+    # One failing judge call must not discard the verdicts already paid for in the same batch.
+    df = _dataset(3)
+    ev.run_answer_stage(df, "en", "fr", "tested", 0.0, 16, str(tmp), client=StubClient())
+    answers = ev.load_answers(str(tmp), "en", "fr", "tested")
+    client = StubClient(fail_on="fr question 1")
+    try:
+        ev.run_judge_stage(
+            df, answers, "en", "fr", "tested", "judge-yes", str(tmp),
+            workers=3, batch_size=10, client=client,
+        )
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("judge failure was swallowed")
+    assert len(pd.read_csv(tmp / "en_source_judgments.csv")) == 3
+    assert set(pd.read_csv(tmp / "fr_judgments.csv", dtype=str)["q_id"]) == {"0", "2"}
+    print("[ok] verdicts of a failed batch are checkpointed before the error")
+
+
+def check_daemon(tmp: Path) -> None:
+    # Jobs go through a real socket; the daemon's shared client is replaced by the stub.
+    from daemon import EvalDaemon, _Handler, _Server
+    from daemon_client import submit
+
+    df = _dataset(4)
+    df.to_csv(tmp / "data.csv", index=False)
+    (tmp / "legacy").mkdir()
+    _write_legacy(tmp / "legacy", df, n=4)
+    for name, artifacts in (("fresh.yaml", "fresh"), ("legacy.yaml", "legacy")):
+        (tmp / name).write_text(
+            "data:\n  csv_path: data.csv\n"
+            "eval:\n  source_lang: en\n  target_lang: [fr]\n"
+            "models:\n  tested_model: tested\n  judge_model: judge-yes\n"
+            f"artifacts_dir: {artifacts}\n",
+            encoding="utf-8",
+        )
+
+    daemon = EvalDaemon(max_inflight=4)
+    client = StubClient(delay=0.02)
+    daemon._client = client
+    socket_path = str(tmp / "daemon.sock")
+    server = _Server(socket_path, _Handler)
+    server.eval_daemon = daemon
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cwd = os.getcwd()
+    os.chdir(tmp)  # relative config paths resolve against the submitting client's cwd
+    try:
+        def _job(op: str, config: str, **params) -> list:
+            return list(submit(op, socket_path=socket_path, config=str(tmp / config), **params))
+
+        # Two concurrent eval jobs on the same target: the second waits and reuses the first's work.
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(_job("eval", "fresh.yaml"))) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert all(evs[-1] == {"event": "done", "ok": True} for evs in results), results
+        assert client.calls == Counter({"tested": 8, "judge-yes": 8}), client.calls
+
+        # shutdown is refused while a job runs, instead of killing it midway.
+        client.delay = 0.2
+        job = threading.Thread(target=lambda: results.append(_job("eval", "fresh.yaml", targets=["en"])))
+        job.start()
+        while not daemon.active_jobs:
+            time.sleep(0.01)
+        events = list(submit("shutdown", socket_path=socket_path))
+        assert events[-1] == {"event": "done", "ok": False} and "active job" in events[0]["message"], events
+        job.join()
+        assert results[-1][-1] == {"event": "done", "ok": True}, results[-1]
+        client.delay = 0.0
+
+        # rejudge of a legacy dir through the daemon judges every answer with the requested judge.
+        client.calls.clear()
+        events = _job("rejudge", "legacy.yaml", judge_model="judge-no")
+        assert events[-1]["ok"], events
+        assert client.calls == Counter({"judge-no": 8}), client.calls
+        result = next(e for e in events if e["event"] == "result")
+        assert result["metrics"]["overall_success"] == 0.0
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+        server.server_close()
+    print("[ok] daemon serialises jobs per target, refuses shutdown mid-job, rejudges with the requested judge")
+
+
+def check_daemon_client_foreign_listener(tmp: Path) -> None:
+    # A non-daemon listener on the socket path is reported as "not running", not as a crash.
+    import socket
+    from daemon_client import is_running
+
+    socket_path = str(tmp / "other.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as srv:
+        srv.bind(socket_path)
+        srv.listen(1)
+
+        def _reply():
+            conn, _ = srv.accept()
+            with conn:
+                conn.recv(4096)
+                conn.sendall(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+
+        threading.Thread(target=_reply, daemon=True).start()
+        assert is_running(socket_path) is False
+    print("[ok] daemon client treats a foreign listener as not running")
+
+
+def main():
+    for check in (
+        check_legacy_migration_and_rejudge,
+        check_rejudge_untouched_legacy_dir,
+        check_numeric_prompt_id,
+        check_same_language,
+        check_answers_keyed_by_source,
+        check_na_like_answer_rejudged,
+        check_failed_judge_keeps_batch,
+        check_daemon,
+        check_daemon_client_foreign_listener,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            check(Path(tmp))
+    print("All stage checks passed.")
+
+
+if __name__ == "__main__":
+    main()
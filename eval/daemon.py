@@ -0,0 +1,338 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import json
+import os
+import socket
+import socketserver
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from io_utils import load_config, load_long_csv, load_judge_prompt
+from eval import build_pairs, run_pairwise_eval, judge_tag
+from metrics import compute_metrics
+from openrouter_client import OpenAIClient
+from rejudge import rejudge_target
+from daemon_client import default_socket_path, is_running
+
+Emit = Callable[[dict], None]
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        description="Long-lived local eval daemon: keeps dataset, pair tables, HTTP pools and caches warm."
+    )
+    p.add_argument("--socket", default=None, help="Unix socket path (default: $EVAL_DAEMON_SOCKET or a per-user 0700 dir)")
+    p.add_argument("--max-inflight", type=int, default=16, help="Max concurrent API requests across all jobs")
+    p.add_argument("--preload", default=None, help="Optional config.yaml whose dataset is loaded at startup")
+    return p.parse_args()
+
+
+class EvalDaemon:
+    """
+    Resident state shared by every job:
+      - long CSV per (path, max_examples), reloaded when the file changes
+      - pair tables per (dataset, source, target)
+      - one pooled API client whose in-flight requests are capped by a shared semaphore
+      - one lock per (artifacts_dir, source, target): jobs on the same target run one after
+        another, so the second one reuses the first one's answers/verdicts instead of paying again
+    Answer/judgment tables stay cached in-process by eval._read_csv_cached.
+    """
+
+    def __init__(self, max_inflight: int):
+        self.max_inflight = max_inflight
+        self.limiter = threading.BoundedSemaphore(max_inflight)
+        self._lock = threading.Lock()
+        self._datasets: Dict[Tuple[str, Optional[int]], Tuple[int, pd.DataFrame]] = {}
+        self._pairs: Dict[Tuple[str, Optional[int], int, str, str], pd.DataFrame] = {}
+        self._client: Optional[OpenAIClient] = None
+        self._target_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self.active_jobs = 0
+        self.finished_jobs = 0
+        self.closing = False
+
+    def dataset(self, csv_path: str, max_examples: Optional[int]) -> Tuple[tuple, pd.DataFrame]:
+        path = os.path.abspath(csv_path)
+        stamp = os.stat(path).st_mtime_ns
+        key = (path, max_examples)
+        with self._lock:
+            hit = self._datasets.get(key)
+            if hit is not None and hit[0] == stamp:
+                return key + (stamp,), hit[1]
+        df = load_long_csv(path, max_examples)
+        with self._lock:
+            self._datasets[key] = (stamp, df)
+            # Pair tables built from an older version of this file are stale.
+            self._pairs = {k: v for k, v in self._pairs.items() if k[:2] != key or k[2] == stamp}
+        return key + (stamp,), df
+
+    def pairs(self, dataset_key: tuple, df: pd.DataFrame, source: str, target: str) -> pd.DataFrame:
+        key = dataset_key + (source, target)
+        with self._lock:
+            hit = self._pairs.get(key)
+        if hit is not None:
+            return hit
+        pairs = build_pairs(df, source, target)
+        with self._lock:
+            self._pairs[key] = pairs
+        return pairs
+
+    def client(self) -> OpenAIClient:
+        with self._lock:
+            if self._client is None:
+                # client = OpenRouterClient(...)
+                self._client = OpenAIClient(pool_size=self.max_inflight, limiter=self.limiter)
+            return self._client
+
+    def target_lock(self, artifacts_dir: str, source: str, target: str) -> threading.Lock:
+        key = (os.path.abspath(artifacts_dir), source, target)
+        with self._lock:
+            return self._target_locks.setdefault(key, threading.Lock())
+
+    def _acquire_target(self, artifacts_dir: str, source: str, target: str, emit: Emit) -> threading.Lock:
+        lock = self.target_lock(artifacts_dir, source, target)
+        if not lock.acquire(blocking=False):
+            emit({"event": "log", "message": f"[info] {source} → {target}: waiting for another job on the same artifacts"})
+            lock.acquire()
+        return lock
+
+    def begin_job(self) -> None:
+        with self._lock:
+            if self.closing:
+                raise RuntimeError("Eval daemon is shutting down; not accepting new jobs")
+            self.active_jobs += 1
+
+    def end_job(self) -> None:
+        with self._lock:
+            self.active_jobs -= 1
+            self.finished_jobs += 1
+
+    def request_shutdown(self) -> None:
+        # Refused while jobs run: daemon threads would be killed mid-job on exit.
+        with self._lock:
+            if self.active_jobs:
+                raise RuntimeError(f"Eval daemon has {self.active_jobs} active job(s); shut down once they finish")
+            self.closing = True
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "max_inflight": self.max_inflight,
+                "active_jobs": self.active_jobs,
+                "finished_jobs": self.finished_jobs,
+                "datasets": [f"{path} (max_examples={n})" for path, n in self._datasets],
+                "pair_tables": len(self._pairs),
+            }
+
+    def run_eval(self, req: dict, emit: Emit) -> bool:
+        cfg = load_config(req["config"], base_dir=req["cwd"])
+        ds_key, df = self.dataset(cfg.csv_path, cfg.max_examples)
+        targets = _targets(req.get("targets"), cfg.target_lang)
+        workers = req.get("workers") or min(4, len(targets))
+        judge_prompt = load_judge_prompt(cfg.judge_prompt_path)
+        client = self.client()
+
+        emit({"event": "log", "message": f"[info] Source: {cfg.source_lang} | Targets: {targets} | Concurrency: {workers}"})
+        emit({"event": "log", "message": f"[info] Artifacts dir: {os.path.abspath(cfg.artifacts_dir)}"})
+
+        def _one(tgt: str) -> dict:
+            lock = self._acquire_target(cfg.artifacts_dir, cfg.source_lang, tgt, emit)
+            try:
+                preds = run_pairwise_eval(
+                    df=df,
+                    source_lang=cfg.source_lang,
+                    target_lang=tgt,
+                    tested_model=cfg.tested_model,
+                    judge_model=cfg.judge_model,
+                    temperature=cfg.temperature,
+                    max_tokens=cfg.max_tokens,
+                    outdir=cfg.artifacts_dir,
+                    judge_prompt=judge_prompt,
+                    judge_workers=cfg.judge_workers,
+                    judge_batch_size=cfg.judge_batch_size,
+                    client=client,
+                    pairs=self.pairs(ds_key, df, cfg.source_lang, tgt),
+                    progress=lambda p: emit({"event": "progress", "target": tgt, **p}),
+                )
+                metrics = compute_metrics(preds)
+                metrics_path = os.path.join(cfg.artifacts_dir, f"{tgt}_metrics.json")
+                with open(metrics_path, "w", encoding="utf-8") as f:
+                    json.dump(metrics, f, indent=2)
+            finally:
+                lock.release()
+            return {
+                "metrics": metrics,
+                "rows": len(preds),
+                "preds": os.path.join(cfg.artifacts_dir, f"{tgt}_predictions.csv"),
+                "metrics_path": metrics_path,
+            }
+
+        ok = True
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_one, tgt): tgt for tgt in targets}
+            for fut in as_completed(futures):
+                tgt = futures[fut]
+                try:
+                    emit({"event": "result", "target": tgt, **fut.result()})
+                except Exception as e:
+                    ok = False
+                    emit({"event": "error", "target": tgt, "message": str(e)})
+        return ok
+
+    def run_rejudge(self, req: dict, emit: Emit) -> bool:
+        cfg = load_config(req["config"], base_dir=req["cwd"])
+        ds_key, df = self.dataset(cfg.csv_path, cfg.max_examples)
+        targets = _targets(req.get("targets"), cfg.target_lang)
+        judge_model = req.get("judge_model") or cfg.judge_model
+        judge_prompt = load_judge_prompt(req.get("judge_prompt_path") or cfg.judge_prompt_path)
+        workers = req.get("workers") or cfg.judge_workers
+        batch_size = req.get("batch_size") or cfg.judge_batch_size
+        client = self.client()
+
+        emit({"event": "log", "message": (
+            f"[info] Tested model: {cfg.tested_model} | Judge: {judge_model} | Tag: {judge_tag(judge_model, judge_prompt)}"
+        )})
+
+        # Sequential targets, as in rejudge.py, so the shared source verdicts are reused.
+        ok = True
+        for tgt in targets:
+            lock = self._acquire_target(cfg.artifacts_dir, cfg.source_lang, tgt, emit)
+            try:
+                out = rejudge_target(
+                    df=df,
+                    artifacts_dir=cfg.artifacts_dir,
+                    source=cfg.source_lang,
+                    target=tgt,
+                    tested_model=cfg.tested_model,
+                    judge_model=judge_model,
+                    judge_prompt=judge_prompt,
+                    workers=workers,
+                    batch_size=batch_size,
+                    client=client,
+                    pairs=self.pairs(ds_key, df, cfg.source_lang, tgt),
+                    progress=lambda p, tgt=tgt: emit({"event": "progress", "target": tgt, **p}),
+                )
+            except Exception as e:
+                ok = False
+                emit({"event": "error", "target": tgt, "message": str(e)})
+                continue
+            finally:
+                lock.release()
+            if out is None:
+                emit({"event": "log", "message": f"[skip] {tgt}: no stored answers for {cfg.tested_model}"})
+                continue
+            metrics, preds_path, metrics_path = out
+            emit({"event": "result", "target": tgt, "metrics": metrics, "preds": preds_path, "metrics_path": metrics_path})
+        return ok
+
+
+def _targets(requested, configured) -> list:
+    targets = requested or configured
+    if isinstance(targets, str):
+        targets = [targets]
+    if not targets:
+        raise ValueError("No targets provided. Pass targets or set `eval.target_lang` in YAML.")
+    return list(targets)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        daemon: EvalDaemon = self.server.eval_daemon
+        write_lock = threading.Lock()
+        connected = True
+
+        def emit(event: dict) -> None:
+            nonlocal connected
+            with write_lock:
+                if not connected:
+                    return
+                try:
+                    self.wfile.write((json.dumps(event, default=str) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+                except OSError:
+                    # Client went away; let the job finish, its results are persisted anyway.
+                    connected = False
+
+        line = self.rfile.readline()
+        if not line:
+            return
+        ok = True
+        try:
+            req = json.loads(line)
+            op = req.get("op")
+            if op == "ping":
+                emit({"event": "result", **daemon.status()})
+            elif op == "shutdown":
+                daemon.request_shutdown()
+                emit({"event": "log", "message": "[info] Eval daemon shutting down"})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            elif op in ("eval", "rejudge"):
+                daemon.begin_job()
+                try:
+                    run = daemon.run_eval if op == "eval" else daemon.run_rejudge
+                    ok = run(req, emit)
+                finally:
+                    daemon.end_job()
+            else:
+                raise ValueError(f"Unknown op: {op!r}")
+        except Exception as e:
+            ok = False
+            emit({"event": "error", "message": str(e)})
+        emit({"event": "done", "ok": ok})
+
+
+def _accepts_connections(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+            return True
+        except OSError:
+            return False
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def main():
+    args = parse_args()
+    socket_path = args.socket or default_socket_path()
+
+    if os.path.exists(socket_path):
+        if is_running(socket_path):
+            raise SystemExit(f"[error] An eval daemon is already listening on {socket_path}")
+        if _accepts_connections(socket_path):
+            raise SystemExit(f"[error] {socket_path} is in use by something other than the eval daemon")
+        os.unlink(socket_path)  # stale socket from a crashed daemon
+
+    daemon = EvalDaemon(max_inflight=args.max_inflight)
+    if args.preload:
+        cfg = load_config(args.preload, base_dir=os.getcwd())
+        _, df = daemon.dataset(cfg.csv_path, cfg.max_examples)
+        print(f"[info] Preloaded {cfg.csv_path}: rows={len(df)}")
+
+    # Bind under a strict umask so the socket is never connectable by other users, not even briefly.
+    old_umask = os.umask(0o077)
+    try:
+        server = _Server(socket_path, _Handler)
+    finally:
+        os.umask(old_umask)
+
+    with server:
+        server.eval_daemon = daemon
+        print(f"[info] Eval daemon listening on {socket_path} (max in-flight requests: {args.max_inflight})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+    print("[info] Eval daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import json
+import os
+import socket
+import stat
+import tempfile
+from typing import Iterable, Iterator, Optional
+
+# Standard library only: submitting a job to the daemon must not pay for pandas or the dataset.
+
+
+def _check_owned(path: str, private: bool = False) -> None:
+    # Refuse sockets/dirs another local user could have planted (or, for dirs, could write into).
+    st = os.lstat(path)
+    if st.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by another user; refusing to use it")
+    if private and (not stat.S_ISDIR(st.st_mode) or st.st_mode & 0o077):
+        raise PermissionError(f"{path} must be a directory accessible only by its owner (mode 0700)")
+
+
+def _private_dir() -> str:
+    runtime = os.getenv("XDG_RUNTIME_DIR")
+    if runtime and os.path.isdir(runtime):
+        return runtime  # per-user and 0700 by spec
+    path = os.path.join(tempfile.gettempdir(), f"mllm-eval-{os.getuid()}")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    _check_owned(path, private=True)
+    return path
+
+
+def default_socket_path() -> str:
+    return os.getenv("EVAL_DAEMON_SOCKET") or os.path.join(_private_dir(), "mllm-eval.sock")
+
+
+def submit(op: str, socket_path: Optional[str] = None, **params) -> Iterator[dict]:
+    """
+    Send one job to the eval daemon and yield its events as they stream back:
+      {"event": "log" | "progress" | "result" | "error" | "done", ...}
+    The last event is always {"event": "done", "ok": bool}.
+    Relative paths in the job are resolved against the caller's cwd.
+    """
+    request = {"op": op, "cwd": os.getcwd(), **params}
+    socket_path = socket_path or default_socket_path()
+    _check_owned(socket_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as stream:
+            for line in stream:
+                event = json.loads(line)
+                yield event
+                if event.get("event") == "done":
+                    return
+    raise ConnectionError("Eval daemon closed the connection before the job finished")
+
+
+def is_running(socket_path: Optional[str] = None) -> bool:
+    try:
+        for _ in submit("ping", socket_path=socket_path):
+            pass
+        return True
+    except (OSError, ValueError):
+        # ValueError: something other than the daemon answered (not JSON lines)
+        return False
+
+
+def print_events(events: Iterable[dict]) -> bool:
+    """
+    Print streamed events in the same [info]/[ok]/[error] style as the CLIs.
+    Returns True if the job finished without errors.
+    """
+    ok = False
+    for ev in events:
+        kind = ev.get("event")
+        target = ev.get("target")
+        prefix = f"{target}: " if target else ""
+        if kind == "log":
+            print(ev["message"])
+        elif kind == "progress":
+            done, total = ev["done"], ev["total"]
+            # Answers report per q_id; only print every 10th to keep output readable.
+            if ev["stage"] != "answer" or done % 10 == 0 or done == total:
+                print(f"[progress] {prefix}{ev['stage']} {done}/{total}")
+        elif kind == "result":
+            print(f"[ok] {prefix}" + json.dumps({k: v for k, v in ev.items() if k not in ("event", "target")}))
+        elif kind == "error":
+            print(f"[error] {prefix}{ev['message']}")
+        elif kind == "done":
+            ok = bool(ev.get("ok"))
+    return ok
@@ -2,9 +2,11 @@ from __future__ import annotations
 import os
 import pandas as pd
 from openrouter_client import OpenRouterClient, OpenAIClient
-from prompts import qa_user_message, judge_user_message, judge_system_message, JudgeFields
+from prompts import qa_user_message, judge_user_message, judge_system_message, judge_prompt_id, JudgeFields
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+import threading
 import time
 import csv
 
@@ -18,8 +20,9 @@ def judge_correct(
     context: str,
     question: str,
     answer: str,
+    system_prompt: Optional[str] = None,
 ) -> bool:
-    messages = [judge_system_message(), judge_user_message(JudgeFields(context=context, question=question, answer=answer))]
+    messages = [judge_system_message(system_prompt), judge_user_message(JudgeFields(context=context, question=question, answer=answer))]
     out = client.chat(model=judge_model, messages=messages, temperature=0.0, max_tokens=4)
     return out.strip().upper().startswith("Y")  # YES → True, else False
 
@@ -41,68 +44,203 @@ def _call_with_retry(fn, *args, retries: int = 3, backoff: float = 1.5, **kwargs
                 raise
     raise last
 
-def _load_source_cache(path: Path) -> pd.DataFrame:
-    if not path.exists():
-        return pd.DataFrame(columns=["q_id", "q_src", "a_src", "correct_source"])
-    return pd.read_csv(path, dtype={"q_id": str})
+# Every persisted table is tagged with the model(s) that produced it, so answers from one
+# tested model and verdicts from several judges/prompts can live side by side in one artifacts dir.
+SOURCE_ANSWER_COLS = ["q_id", "tested_model", "q_src", "a_src"]
+ANSWER_COLS = ["q_id", "source_lang", "target_lang", "tested_model", "q_src", "q_tgt", "a_src", "a_tgt"]
+SOURCE_JUDGMENT_COLS = ["q_id", "tested_model", "judge_model", "judge_prompt", "correct_source"]
+TARGET_JUDGMENT_COLS = [
+    "q_id", "source_lang", "target_lang", "tested_model", "judge_model", "judge_prompt", "correct_target"
+]
+PREDICTION_COLS = [
+    "q_id", "source_lang", "target_lang", "tested_model", "judge_model", "judge_prompt",
+    "q_src", "q_tgt", "a_src", "a_tgt", "correct_source", "correct_target",
+]
 
-def _save_source_cache(df: pd.DataFrame, path: Path) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    out = df.copy()
-    out["q_id"] = out["q_id"].astype(str)
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    out.to_csv(tmp, index=False, encoding="utf-8-sig", quoting=csv.QUOTE_MINIMAL)
-    os.replace(tmp, path)
+# Keys of each table; target tables also carry source_lang since one target file can hold several sources.
+SOURCE_ANSWER_KEY = ["q_id", "tested_model"]
+ANSWER_KEY = ["q_id", "source_lang", "tested_model"]
+SOURCE_JUDGMENT_KEY = ["q_id", "tested_model", "judge_model", "judge_prompt"]
+TARGET_JUDGMENT_KEY = ["q_id", "source_lang", "tested_model", "judge_model", "judge_prompt"]
+# Identifiers/tags must stay strings: a prompt hash such as "12345678" would otherwise parse as a number.
+_STR_COLS = ["q_id", "source_lang", "target_lang", "tested_model", "judge_model", "judge_prompt"]
 
-def _load_target_preds(path: Path) -> pd.DataFrame:
-    if not path.exists():
-        return pd.DataFrame(
-            columns=[
-                "q_id","source_lang","target_lang","q_src","q_tgt",
-                "a_src","a_tgt","correct_source","correct_target"
-            ]
-        )
-    return pd.read_csv(path, dtype={"q_id": str})
+_FILE_LOCKS: Dict[str, threading.RLock] = {}
+# Parsed tables keyed by path, validated by (mtime_ns, size); keeps caches warm in long-lived processes.
+_TABLE_CACHE: Dict[str, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+_FILE_LOCKS_GUARD = threading.Lock()
+
+def _lock_for(path: Path) -> threading.RLock:
+    # Source-language tables are shared by all targets; run_eval_many writes them from several threads.
+    key = str(path.resolve())
+    with _FILE_LOCKS_GUARD:
+        return _FILE_LOCKS.setdefault(key, threading.RLock())
 
-def _save_target_preds(df: pd.DataFrame, path: Path) -> None:
+def _file_stamp(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+def _read_csv_cached(path: Path) -> pd.DataFrame:
+    key = str(path.resolve())
+    stamp = _file_stamp(path)
+    hit = _TABLE_CACHE.get(key)
+    if hit is not None and hit[0] == stamp:
+        return hit[1].copy()
+    # keep_default_na=False: an answer such as "None", "NA" or "" must come back verbatim, not as NaN.
+    df = pd.read_csv(path, dtype={c: str for c in _STR_COLS}, keep_default_na=False)
+    _TABLE_CACHE[key] = (stamp, df)
+    return df.copy()
+
+def _verdicts(col: pd.Series) -> pd.Series:
+    # Verdict columns hold bools, or "True"/"False" strings when a column also has empty cells.
+    return col.astype(str) == "True"
+
+def _has_verdict(col: pd.Series) -> pd.Series:
+    return col.astype(str).isin(["True", "False"])
+
+def _load_table(
+    path: Path,
+    columns: List[str],
+    fill: Optional[dict] = None,
+    legacy_path: Optional[Path] = None,
+) -> pd.DataFrame:
+    """
+    Read a cached table, falling back to a pre-split artifact (legacy_path) when the table
+    does not exist yet. Untagged legacy rows get their tag columns from `fill`.
+    """
+    src = path if path.exists() else legacy_path
+    if src is None or not src.exists():
+        return pd.DataFrame(columns=columns)
+    df = _read_csv_cached(src)
+    for col, value in (fill or {}).items():
+        if col not in df.columns:
+            df[col] = value
+    if any(c not in df.columns for c in columns):
+        # Legacy file does not carry what this table needs (e.g. no judgments in it).
+        return pd.DataFrame(columns=columns)
+    df = df[columns].copy()
+    df["q_id"] = df["q_id"].astype(str)
+    return df
+
+def _write_csv(df: pd.DataFrame, path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     out = df.copy()
     out["q_id"] = out["q_id"].astype(str)
-    out = out.drop_duplicates(subset=["q_id"], keep="last")
     tmp = path.with_suffix(path.suffix + ".tmp")
     out.to_csv(tmp, index=False, encoding="utf-8-sig", quoting=csv.QUOTE_MINIMAL)
     os.replace(tmp, path)
+    # No write-through: the next read parses the file, so cached tables always equal a fresh read.
+    _TABLE_CACHE.pop(str(path.resolve()), None)
 
+def _merge_table(
+    path: Path,
+    new_rows: List[dict],
+    columns: List[str],
+    key: List[str],
+    fill: Optional[dict] = None,
+    legacy_path: Optional[Path] = None,
+    keep: str = "last",
+) -> pd.DataFrame:
+    """
+    Re-read the table under a per-file lock, upsert new_rows by key, and save atomically.
+    Re-reading keeps rows written concurrently by other targets. keep="first" only adds
+    rows whose key is not stored yet.
+    """
+    with _lock_for(path):
+        out = _load_table(path, columns, fill=fill, legacy_path=legacy_path)
+        if new_rows:
+            out = pd.concat([out, pd.DataFrame(new_rows, columns=columns)], ignore_index=True)
+        out = out.drop_duplicates(subset=key, keep=keep).reset_index(drop=True)
+        _write_csv(out, path)
+    return out
 
-def run_pairwise_eval(
-    df: pd.DataFrame,
+def _answer_paths(out_dir: Path, source_lang: str, target_lang: str) -> Dict[str, Path]:
+    return {
+        "source_answers": out_dir / f"{source_lang}_source_answers.csv",
+        "answers": out_dir / f"{target_lang}_answers.csv",
+        # Pre-split runs stored answers and verdicts together in the predictions file.
+        "legacy_preds": out_dir / f"{target_lang}_predictions.csv",
+    }
+
+def _judgment_paths(out_dir: Path, source_lang: str, target_lang: str) -> Dict[str, Path]:
+    return {
+        "source_judgments": out_dir / f"{source_lang}_source_judgments.csv",
+        "judgments": out_dir / f"{target_lang}_judgments.csv",
+    }
+
+def judge_tag(judge_model: str, judge_prompt: Optional[str] = None) -> str:
+    """
+    Filesystem-safe tag for a (judge model, judge prompt) combination, e.g. "gpt-5__1a2b3c4d".
+    """
+    safe_model = "".join(ch if ch.isalnum() or ch in "-." else "-" for ch in judge_model)
+    return f"{safe_model}__{judge_prompt_id(judge_prompt)}"
+
+
+def migrate_legacy_artifacts(
+    outdir: str,
     source_lang: str,
     target_lang: str,
     tested_model: str,
-    judge_model: str,
-    temperature: float,
-    max_tokens: int,
-    outdir: str,
-) -> pd.DataFrame:
+    legacy_judge_model: str,
+) -> None:
     """
-    Resumable evaluation:
-      - Reuses cached source answers/correctness from {outdir}/{source_lang}_source_answers.csv
-      - Skips q_id already in {outdir}/{target_lang}_predictions.csv
-      - Appends new predictions and dedupes by q_id on save
-      - If source_lang == target_lang, avoids redundant target calls by reusing the source result
+    One-time conversion of pre-split artifacts, where {source_lang}_source_answers.csv and
+    {target_lang}_predictions.csv held untagged answers and verdicts together:
+      - answers are adopted as answers of tested_model
+      - verdicts are adopted as verdicts of legacy_judge_model with the default judge prompt,
+        so only pass the judge that actually produced them
+      - the legacy files are then rewritten in the tagged format, so they are never adopted again
+    Rows already present in the tagged tables are kept as they are.
     """
-
     out_dir = Path(outdir)
-    out_dir.mkdir(parents=True, exist_ok=True)
+    answer_paths = _answer_paths(out_dir, source_lang, target_lang)
+    judgment_paths = _judgment_paths(out_dir, source_lang, target_lang)
+    tags = {"tested_model": tested_model, "judge_model": legacy_judge_model, "judge_prompt": judge_prompt_id(None)}
+
+    source_file = answer_paths["source_answers"]
+    with _lock_for(source_file):
+        if source_file.exists():
+            legacy = _read_csv_cached(source_file)
+            if "tested_model" not in legacy.columns:
+                if "correct_source" in legacy.columns:
+                    rows = legacy[_has_verdict(legacy["correct_source"])].assign(**tags)
+                    rows["correct_source"] = _verdicts(rows["correct_source"])
+                    _merge_table(
+                        judgment_paths["source_judgments"],
+                        rows[SOURCE_JUDGMENT_COLS].to_dict("records"),
+                        SOURCE_JUDGMENT_COLS, SOURCE_JUDGMENT_KEY, keep="first",
+                    )
+                _write_csv(legacy.assign(tested_model=tested_model)[SOURCE_ANSWER_COLS], source_file)
+
+    preds_file = answer_paths["legacy_preds"]
+    with _lock_for(preds_file):
+        if preds_file.exists():
+            legacy = _read_csv_cached(preds_file)
+            if "judge_model" not in legacy.columns and all(c in legacy.columns for c in ANSWER_COLS if c != "tested_model"):
+                legacy = legacy.assign(**tags)
+                _merge_table(
+                    answer_paths["answers"], legacy[ANSWER_COLS].to_dict("records"),
+                    ANSWER_COLS, ANSWER_KEY, keep="first",
+                )
+                if "correct_target" in legacy.columns:
+                    rows = legacy[_has_verdict(legacy["correct_target"])].copy()
+                    rows["correct_target"] = _verdicts(rows["correct_target"])
+                    _merge_table(
+                        judgment_paths["judgments"],
+                        rows[TARGET_JUDGMENT_COLS].to_dict("records"),
+                        TARGET_JUDGMENT_COLS, TARGET_JUDGMENT_KEY, keep="first",
+                    )
+                if all(c in legacy.columns for c in PREDICTION_COLS):
+                    _write_csv(legacy[PREDICTION_COLS], preds_file)
 
-    # client = OpenRouterClient()
-    client = OpenAIClient()
 
-    # Normalize identifiers early
+def build_pairs(df: pd.DataFrame, source_lang: str, target_lang: str) -> pd.DataFrame:
+    """
+    One row per q_id with source & target question/context (q_src, c_src, q_tgt, c_tgt).
+    """
     df = df.copy()
     df["q_id"] = df["q_id"].astype(str)
 
-    # Build pair table (one row per q_id with both source & target info)
     base = df[df["original_lang"] == source_lang]
     src = (
         base[base["language"] == source_lang][["q_id", "question", "content"]]
@@ -112,8 +250,7 @@ def run_pairwise_eval(
         base[base["language"] == target_lang][["q_id", "question", "content"]]
         .rename(columns={"question": "q_tgt", "content": "c_tgt"})
     )
-    same_lang = (source_lang == target_lang)
-    if same_lang:
+    if source_lang == target_lang:
         # Avoid self-join duplicates; reuse source text for target columns.
         pairs = src.copy()
         pairs["q_tgt"] = pairs["q_src"]
@@ -126,97 +263,297 @@ def run_pairwise_eval(
             f"No aligned pairs for original_lang={source_lang}, "
             f"source={source_lang}→target={target_lang}."
         )
+    return pairs.reset_index(drop=True)
 
-    # Load caches/files (part of resumability)
-    source_file = out_dir / f"{source_lang}_source_answers.csv"
-    cache_df = _load_source_cache(source_file)
-    cache_df["q_id"] = cache_df["q_id"].astype(str)
-    source_cache: Dict[str, Tuple[str, bool]] = {
-        r["q_id"]: (r["a_src"], bool(r["correct_source"])) for _, r in cache_df.iterrows()
-    }
 
-    target_file = out_dir / f"{target_lang}_predictions.csv"
-    existing_preds = _load_target_preds(target_file)
-    existing_preds["q_id"] = existing_preds["q_id"].astype(str)
-    already_done = set(existing_preds["q_id"].unique())
+def load_answers(outdir: str, source_lang: str, target_lang: str, tested_model: str) -> pd.DataFrame:
+    """
+    Stored answers of tested_model for source_lang → target_lang, without calling any model.
+    """
+    paths = _answer_paths(Path(outdir), source_lang, target_lang)
+    answers = _load_table(
+        paths["answers"], ANSWER_COLS,
+        fill={"tested_model": tested_model}, legacy_path=paths["legacy_preds"],
+    )
+    answers = answers[
+        (answers["tested_model"] == tested_model)
+        & (answers["source_lang"] == source_lang)
+        & (answers["target_lang"] == target_lang)
+    ]
+    return answers.reset_index(drop=True)
+
+
+def run_answer_stage(
+    df: pd.DataFrame,
+    source_lang: str,
+    target_lang: str,
+    tested_model: str,
+    temperature: float,
+    max_tokens: int,
+    outdir: str,
+    client: Optional[OpenRouterClient | OpenAIClient] = None,
+    pairs: Optional[pd.DataFrame] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> pd.DataFrame:
+    """
+    Resumable answer stage (no judging):
+      - Reuses source answers of tested_model from {outdir}/{source_lang}_source_answers.csv
+      - Skips (q_id, source_lang, tested_model) already in {outdir}/{target_lang}_answers.csv
+      - If source_lang == target_lang, reuses the source answer as the target answer
+      - Untagged answers from pre-split artifacts are adopted as answers of tested_model;
+        call migrate_legacy_artifacts first to keep their verdicts (run_pairwise_eval does)
+    pairs (from build_pairs) may be passed in to skip rebuilding them; progress receives
+    {"stage", "done", "total"} after every answered q_id.
+    """
+    out_dir = Path(outdir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    client = client or OpenAIClient()
+    paths = _answer_paths(out_dir, source_lang, target_lang)
+    tagged = {"tested_model": tested_model}
+    same_lang = (source_lang == target_lang)
+
+    if pairs is None:
+        pairs = build_pairs(df, source_lang, target_lang)
+
+    src_df = _load_table(paths["source_answers"], SOURCE_ANSWER_COLS, fill=tagged)
+    src_df = src_df[src_df["tested_model"] == tested_model]
+    source_cache: Dict[str, str] = dict(zip(src_df["q_id"], src_df["a_src"]))
+
+    # Saving right away persists answers adopted from a legacy predictions file.
+    ans_df = _merge_table(
+        paths["answers"], [], ANSWER_COLS, ANSWER_KEY,
+        fill=tagged, legacy_path=paths["legacy_preds"],
+    )
+    already_done = set(ans_df.loc[
+        (ans_df["tested_model"] == tested_model) & (ans_df["source_lang"] == source_lang), "q_id"
+    ])
 
-    # Worklist = only q_ids not already completed
     to_process = pairs[~pairs["q_id"].isin(already_done)]
-    if to_process.empty:
-        return existing_preds.reset_index(drop=True)
 
-    new_records = []
+    new_sources: List[dict] = []
+    new_answers: List[dict] = []
     for _, row in to_process.iterrows():
         qid = row["q_id"]
 
-        # 1) Source answer (reuse cache if present)
         if qid in source_cache:
-            a_src, correct_s = source_cache[qid]
+            a_src = source_cache[qid]
         else:
             a_src = _call_with_retry(
                 answer_question, client, tested_model, row["q_src"], temperature, max_tokens
             )
-            correct_s = _call_with_retry(
-                judge_correct,
-                client,
-                judge_model,
-                context=row["c_src"],
-                question=row["q_src"],
-                answer=a_src,
-            )
-            source_cache[qid] = (a_src, bool(correct_s))
-            cache_df = pd.concat(
-                [cache_df, pd.DataFrame([{
-                    "q_id": qid,
-                    "q_src": row["q_src"],
-                    "a_src": a_src,
-                    "correct_source": bool(correct_s),
-                }])],
-                ignore_index=True,
-            )
+            source_cache[qid] = a_src
+            new_sources.append({"q_id": qid, "tested_model": tested_model, "q_src": row["q_src"], "a_src": a_src})
 
-        # 2) Target part
         if same_lang:
-            # Source and target are identical; reuse the computed source answer and judgment.
             a_tgt = a_src
-            correct_t = correct_s
         else:
             a_tgt = _call_with_retry(
                 answer_question, client, tested_model, row["q_tgt"], temperature, max_tokens
             )
-            # 3) Judge target (do NOT re-judge source)
-            correct_t = _call_with_retry(
-                judge_correct,
-                client,
-                judge_model,
-                context=row["c_tgt"],
-                question=row["q_tgt"],
-                answer=a_tgt,
-            )
 
-        new_records.append(
+        new_answers.append(
             {
                 "q_id": qid,
                 "source_lang": source_lang,
                 "target_lang": target_lang,
+                "tested_model": tested_model,
                 "q_src": row["q_src"],
                 "q_tgt": row["q_tgt"],
                 "a_src": a_src,
                 "a_tgt": a_tgt,
-                "correct_source": bool(correct_s),
-                "correct_target": bool(correct_t),
             }
         )
 
+        if progress is not None:
+            progress({"stage": "answer", "done": len(new_answers), "total": len(to_process)})
+
         # incremental checkpoint every 50 examples
-        if len(new_records) % 50 == 0:
-            checkpoint_df = pd.concat([existing_preds, pd.DataFrame(new_records)], ignore_index=True)
-            _save_target_preds(checkpoint_df, target_file)
-            _save_source_cache(cache_df, source_file)
+        if len(new_answers) % 50 == 0:
+            _merge_table(paths["source_answers"], new_sources, SOURCE_ANSWER_COLS, SOURCE_ANSWER_KEY, fill=tagged)
+            _merge_table(paths["answers"], new_answers, ANSWER_COLS, ANSWER_KEY, fill=tagged)
+
+    if new_answers:
+        _merge_table(paths["source_answers"], new_sources, SOURCE_ANSWER_COLS, SOURCE_ANSWER_KEY, fill=tagged)
+        _merge_table(paths["answers"], new_answers, ANSWER_COLS, ANSWER_KEY, fill=tagged)
 
-    # Merge existing + new, dedupe by q_id, and save
-    out_df = pd.concat([existing_preds, pd.DataFrame(new_records)], ignore_index=True)
-    _save_target_preds(out_df, target_file)
-    _save_source_cache(cache_df, source_file)
+    return load_answers(outdir, source_lang, target_lang, tested_model)
+
+
+def run_judge_stage(
+    df: pd.DataFrame,
+    answers: pd.DataFrame,
+    source_lang: str,
+    target_lang: str,
+    tested_model: str,
+    judge_model: str,
+    outdir: str,
+    judge_prompt: Optional[str] = None,
+    workers: int = 8,
+    batch_size: int = 50,
+    predictions_path: Optional[str] = None,
+    client: Optional[OpenRouterClient | OpenAIClient] = None,
+    pairs: Optional[pd.DataFrame] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> pd.DataFrame:
+    """
+    Resumable, concurrent judge stage over stored answers:
+      - Verdicts are cached per (q_id, tested_model, judge_model, judge_prompt) in
+        {outdir}/{source_lang}_source_judgments.csv and {outdir}/{target_lang}_judgments.csv
+      - Never adopts untagged legacy verdicts (see migrate_legacy_artifacts)
+      - Pending verdicts are requested in batches of batch_size on `workers` threads;
+        each finished batch is checkpointed
+      - If source_lang == target_lang, the target verdict reuses the source verdict
+      - Writes the joined predictions to predictions_path (default {outdir}/{target_lang}_predictions.csv)
+    progress receives {"stage", "done", "total"} after every batch.
+    """
+    out_dir = Path(outdir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    client = client or OpenAIClient(pool_size=max(1, workers))
+    paths = _judgment_paths(out_dir, source_lang, target_lang)
+    prompt_id = judge_prompt_id(judge_prompt)
+    tags = {"tested_model": tested_model, "judge_model": judge_model, "judge_prompt": prompt_id}
+    tgt_tags = {"source_lang": source_lang, **tags}
+    same_lang = (source_lang == target_lang)
 
-    return out_df.reset_index(drop=True)
+    # Contexts are not stored with the answers; take them from the dataset.
+    if pairs is None:
+        pairs = build_pairs(df, source_lang, target_lang)
+    items = answers[answers["tested_model"] == tested_model].drop_duplicates(subset=["q_id"], keep="last")
+    items = items.merge(pairs[["q_id", "c_src", "c_tgt"]], on="q_id", how="inner")
+
+    def _select(table: pd.DataFrame, match: dict) -> pd.DataFrame:
+        mask = pd.Series(True, index=table.index)
+        for col, value in match.items():
+            mask &= table[col] == value
+        return table[mask]
+
+    src_j = _load_table(paths["source_judgments"], SOURCE_JUDGMENT_COLS)
+    tgt_j = _load_table(paths["judgments"], TARGET_JUDGMENT_COLS)
+    src_done = set(_select(src_j, tags)["q_id"])
+    tgt_done = set(_select(tgt_j, tgt_tags)["q_id"])
+
+    # (side, q_id, context, question, answer)
+    tasks = [
+        ("source", r["q_id"], r["c_src"], r["q_src"], r["a_src"])
+        for _, r in items.iterrows() if r["q_id"] not in src_done
+    ]
+    if not same_lang:
+        tasks += [
+            ("target", r["q_id"], r["c_tgt"], r["q_tgt"], r["a_tgt"])
+            for _, r in items.iterrows() if r["q_id"] not in tgt_done
+        ]
+
+    def _judge_task(task) -> bool:
+        _, _, context, question, answer = task
+        return bool(_call_with_retry(
+            judge_correct,
+            client,
+            judge_model,
+            context=context,
+            question=question,
+            answer=answer,
+            system_prompt=judge_prompt,
+        ))
+
+    if tasks:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for start in range(0, len(tasks), max(1, batch_size)):
+                batch = tasks[start:start + max(1, batch_size)]
+                futures = {pool.submit(_judge_task, t): t for t in batch}
+                judged, failure = [], None
+                for fut in as_completed(futures):
+                    try:
+                        judged.append((futures[fut], fut.result()))
+                    except Exception as e:
+                        failure = failure or e
+                # Checkpoint what this batch did get before surfacing a failure, so paid verdicts are kept.
+                src_rows = [
+                    {"q_id": t[1], **tags, "correct_source": v}
+                    for t, v in judged if t[0] == "source"
+                ]
+                tgt_rows = [
+                    {"q_id": t[1], "target_lang": target_lang, **tgt_tags, "correct_target": v}
+                    for t, v in judged if t[0] == "target"
+                ]
+                src_j = _merge_table(paths["source_judgments"], src_rows, SOURCE_JUDGMENT_COLS, SOURCE_JUDGMENT_KEY)
+                tgt_j = _merge_table(paths["judgments"], tgt_rows, TARGET_JUDGMENT_COLS, TARGET_JUDGMENT_KEY)
+                if failure is not None:
+                    raise failure
+                if progress is not None:
+                    progress({"stage": "judge", "done": start + len(batch), "total": len(tasks)})
+
+    # Join answers with this judge's verdicts
+    preds = items.drop(columns=["c_src", "c_tgt"]).merge(
+        _select(src_j, tags)[["q_id", "correct_source"]], on="q_id", how="inner"
+    )
+    if same_lang:
+        preds["correct_target"] = preds["correct_source"]
+    else:
+        preds = preds.merge(_select(tgt_j, tgt_tags)[["q_id", "correct_target"]], on="q_id", how="inner")
+    preds["judge_model"] = judge_model
+    preds["judge_prompt"] = prompt_id
+    preds["correct_source"] = _verdicts(preds["correct_source"])
+    preds["correct_target"] = _verdicts(preds["correct_target"])
+    preds = preds[PREDICTION_COLS].reset_index(drop=True)
+
+    _write_csv(preds, Path(predictions_path) if predictions_path else out_dir / f"{target_lang}_predictions.csv")
+    return preds
+
+
+def run_pairwise_eval(
+    df: pd.DataFrame,
+    source_lang: str,
+    target_lang: str,
+    tested_model: str,
+    judge_model: str,
+    temperature: float,
+    max_tokens: int,
+    outdir: str,
+    judge_prompt: Optional[str] = None,
+    judge_workers: int = 8,
+    judge_batch_size: int = 50,
+    client: Optional[OpenRouterClient | OpenAIClient] = None,
+    pairs: Optional[pd.DataFrame] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> pd.DataFrame:
+    """
+    Answer stage followed by judge stage; both are resumable and persist separately
+    (see run_answer_stage / run_judge_stage). Use rejudge.py to score stored answers
+    with another judge without re-running the answer stage.
+    Pre-split artifacts in outdir are migrated first; their verdicts are attributed to
+    judge_model, i.e. the judge of the run config that produced them.
+    """
+    # client = OpenRouterClient()
+    client = client or OpenAIClient(pool_size=max(1, judge_workers))
+    if pairs is None:
+        pairs = build_pairs(df, source_lang, target_lang)
+    # Before the answer stage, which rewrites the shared source answers file.
+    migrate_legacy_artifacts(outdir, source_lang, target_lang, tested_model, legacy_judge_model=judge_model)
+
+    answers = run_answer_stage(
+        df=df,
+        source_lang=source_lang,
+        target_lang=target_lang,
+        tested_model=tested_model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        outdir=outdir,
+        client=client,
+        pairs=pairs,
+        progress=progress,
+    )
+    return run_judge_stage(
+        df=df,
+        answers=answers,
+        source_lang=source_lang,
+        target_lang=target_lang,
+        tested_model=tested_model,
+        judge_model=judge_model,
+        outdir=outdir,
+        judge_prompt=judge_prompt,
+        workers=judge_workers,
+        batch_size=judge_batch_size,
+        client=client,
+        pairs=pairs,
+        progress=progress,
+    )
@@ -29,21 +29,35 @@ class Config:
     temperature: float
     max_tokens: int
     artifacts_dir: str
+    judge_prompt_path: str | None = None
+    judge_workers: int = 8
+    judge_batch_size: int = 50
 
-def load_config(path: str) -> Config:
+def load_config(path: str, base_dir: str | None = None) -> Config:
+    """
+    base_dir: directory that relative paths in the YAML are resolved against
+    (default: the current working directory, as before). The eval daemon passes
+    the submitting client's cwd here.
+    """
     with open(path, "r", encoding="utf-8") as f:
         cfg = yaml.safe_load(f)
 
+    def _resolve(p: str | None) -> str | None:
+        if p is None or base_dir is None or os.path.isabs(p):
+            return p
+        return os.path.join(base_dir, p)
+
     data = cfg.get("data", {})
     eval_ = cfg.get("eval", {})
     models = cfg.get("models", {})
     decode = cfg.get("decode", {})
-    outdir = cfg.get("artifacts_dir", "./artifacts")
+    judge = cfg.get("judge", {})
+    outdir = _resolve(cfg.get("artifacts_dir", "./artifacts"))
 
     os.makedirs(outdir, exist_ok=True)
 
     resolved = {
-        "csv_path": data.get("csv_path"),
+        "csv_path": _resolve(data.get("csv_path")),
         "max_examples": data.get("max_examples", None),
         "source_lang": eval_.get("source_lang", "en"),
         "target_lang": eval_.get("target_lang", "fr"),
@@ -52,6 +66,9 @@ def load_config(path: str) -> Config:
         "temperature": float(decode.get("temperature", 0.0)),
         "max_tokens": int(decode.get("max_tokens", 128)),
         "artifacts_dir": outdir,
+        "judge_prompt_path": _resolve(judge.get("prompt_path", None)),
+        "judge_workers": int(judge.get("workers", 8)),
+        "judge_batch_size": int(judge.get("batch_size", 50)),
     }
 
     # persist resolved config for provenance
@@ -74,3 +91,11 @@ def load_long_csv(csv_path: str, max_examples: int | None) -> pd.DataFrame:
         unique_ids = df["q_id"].dropna().unique().tolist()[:max_examples]
         df = df[df["q_id"].isin(unique_ids)]
     return df
+
+def load_judge_prompt(path: str | None) -> str | None:
+    # Optional override of the judge system prompt (plain text file); None → default prompt.
+    if not path:
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read().strip()
+    return text or None
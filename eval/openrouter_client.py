@@ -1,5 +1,7 @@
 import os
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from typing import Optional
 
@@ -12,10 +14,29 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_BASE = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
 
 
+def _pooled_session(pool_size: int) -> requests.Session:
+    # Keep-alive connections are reused across calls (and threads) instead of a new TLS handshake per request.
+    # pool_block: threads beyond pool_size wait for a connection instead of opening throwaway ones.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 class OpenRouterClient:
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        pool_size: int = 16,
+        limiter: Optional[threading.Semaphore] = None,
+    ):
         self.api_key = api_key or OPENROUTER_API_KEY
         self.base_url = base_url or OPENROUTER_BASE
+        self.session = _pooled_session(pool_size)
+        # Optional shared cap on in-flight requests (e.g. one semaphore for every job in the eval daemon)
+        self.limiter = limiter
         if not self.api_key:
             raise RuntimeError("Missing OPENROUTER_API_KEY (set it in .env)")
 
@@ -31,7 +52,7 @@ class OpenRouterClient:
             "max_tokens": max_tokens,
             "messages": messages,
         }
-        r = requests.post(url, json=payload, headers=headers, timeout=120)
+        r = self._post(url, json=payload, headers=headers, timeout=120)
         if r.status_code != 200:
             raise RuntimeError(f"OpenRouter error {r.status_code}: {r.text}")
         data = r.json()
@@ -40,11 +61,26 @@ class OpenRouterClient:
         except Exception as e:
             raise RuntimeError(f"Malformed OpenRouter response: {data}") from e
 
+    def _post(self, url: str, **kwargs) -> requests.Response:
+        if self.limiter is None:
+            return self.session.post(url, **kwargs)
+        with self.limiter:
+            return self.session.post(url, **kwargs)
+
 
 class OpenAIClient:
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        pool_size: int = 16,
+        limiter: Optional[threading.Semaphore] = None,
+    ):
         self.api_key = api_key or OPENAI_API_KEY
         self.base_url = base_url or OPENAI_BASE
+        self.session = _pooled_session(pool_size)
+        # Optional shared cap on in-flight requests (e.g. one semaphore for every job in the eval daemon)
+        self.limiter = limiter
         if not self.api_key:
             raise RuntimeError("Missing OPENAI_API_KEY (set it in .env)")
 
@@ -60,7 +96,7 @@ class OpenAIClient:
             # "max_tokens": max_tokens,
             "messages": messages,
         }
-        r = requests.post(url, json=payload, headers=headers, timeout=120)
+        r = self._post(url, json=payload, headers=headers, timeout=120)
         if r.status_code != 200:
             raise RuntimeError(f"OpenAI error {r.status_code}: {r.text}")
         data = r.json()
@@ -69,6 +105,12 @@ class OpenAIClient:
         except Exception as e:
             raise RuntimeError(f"Malformed OpenAI response: {data}") from e
 
+    def _post(self, url: str, **kwargs) -> requests.Response:
+        if self.limiter is None:
+            return self.session.post(url, **kwargs)
+        with self.limiter:
+            return self.session.post(url, **kwargs)
+
 
 # Example usage:
 if __name__ == "__main__":
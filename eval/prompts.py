@@ -1,4 +1,6 @@
+import hashlib
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass(frozen=True)
 class JudgeFields:
@@ -10,16 +12,20 @@ def qa_user_message(question: str) -> dict:
     # Zero-shot, closed-book: only the question
     return {"role": "user", "content": question}
 
-def judge_system_message() -> dict:
-    return {
-        "role": "system",
-        "content": (
-            "You are a strict binary evaluator. "
-            "Given a question, an answer, and a supporting text, reply with exactly one word: YES or NO. "
-            "Reply YES only if the supporting text clearly entails that the answer correctly answers the question. "
-            "Otherwise reply NO. Do not add any explanation."
-        ),
-    }
+DEFAULT_JUDGE_SYSTEM_PROMPT = (
+    "You are a strict binary evaluator. "
+    "Given a question, an answer, and a supporting text, reply with exactly one word: YES or NO. "
+    "Reply YES only if the supporting text clearly entails that the answer correctly answers the question. "
+    "Otherwise reply NO. Do not add any explanation."
+)
+
+def judge_system_message(system_prompt: Optional[str] = None) -> dict:
+    return {"role": "system", "content": system_prompt or DEFAULT_JUDGE_SYSTEM_PROMPT}
+
+def judge_prompt_id(system_prompt: Optional[str] = None) -> str:
+    # Short, stable tag so judgments made with different judge prompts never collide in the caches.
+    text = system_prompt or DEFAULT_JUDGE_SYSTEM_PROMPT
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:8]
 
 def judge_user_message(fields: JudgeFields) -> dict:
     # Keep language alignment: fields.context and fields.question should be in the same language as the model's answer.
@@ -0,0 +1,142 @@
+from __future__ import annotations
+import argparse
+import os
+import json
+import sys
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Re-judge stored answers with another judge model/prompt (no answer calls).")
+    p.add_argument("--config", required=True, help="Path to config.yaml")
+    p.add_argument("--judge-model", default=None, help="Judge model (default: models.judge_model from YAML)")
+    p.add_argument("--judge-prompt", default=None, help="Text file with the judge system prompt (default: judge.prompt_path)")
+    p.add_argument("--targets", nargs="*", default=None, help="Target langs to re-judge (default: eval.target_lang)")
+    p.add_argument("--workers", type=int, default=None, help="Concurrent judge requests (default: judge.workers)")
+    p.add_argument("--batch-size", type=int, default=None, help="Judgments per checkpoint (default: judge.batch_size)")
+    p.add_argument("--daemon", action="store_true", help="Submit the job to a running eval daemon (see daemon.py)")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.daemon:
+        from daemon_client import submit, print_events
+        events = submit(
+            "rejudge",
+            config=os.path.abspath(args.config),
+            judge_model=args.judge_model,
+            judge_prompt_path=os.path.abspath(args.judge_prompt) if args.judge_prompt else None,
+            targets=args.targets,
+            workers=args.workers,
+            batch_size=args.batch_size,
+        )
+        sys.exit(0 if print_events(events) else 1)
+
+    # Imported here so --daemon does not pay for pandas
+    from io_utils import load_config, load_long_csv, load_judge_prompt
+    from eval import judge_tag
+    from openrouter_client import OpenAIClient
+
+    cfg = load_config(args.config)
+    df = load_long_csv(cfg.csv_path, cfg.max_examples)
+
+    targets = args.targets or cfg.target_lang
+    if isinstance(targets, str):
+        targets = [targets]
+    if not targets:
+        raise ValueError("No targets provided. Pass --targets or set `eval.target_lang` in YAML.")
+
+    source = cfg.source_lang
+    judge_model = args.judge_model or cfg.judge_model
+    judge_prompt = load_judge_prompt(args.judge_prompt or cfg.judge_prompt_path)
+    workers = args.workers or cfg.judge_workers
+    batch_size = args.batch_size or cfg.judge_batch_size
+    tag = judge_tag(judge_model, judge_prompt)
+
+    print(f"[info] Tested model: {cfg.tested_model} | Judge: {judge_model} | Tag: {tag}")
+    print(f"[info] Source: {source} | Targets: {targets}")
+    print(f"[info] Concurrency: {workers} | Batch size: {batch_size}")
+
+    client = OpenAIClient(pool_size=max(1, workers))
+
+    # Targets run one after another so later targets reuse the shared source-language verdicts;
+    # concurrency is within each judge stage.
+    for tgt in targets:
+        try:
+            out = rejudge_target(
+                df=df,
+                artifacts_dir=cfg.artifacts_dir,
+                source=source,
+                target=tgt,
+                tested_model=cfg.tested_model,
+                judge_model=judge_model,
+                judge_prompt=judge_prompt,
+                workers=workers,
+                batch_size=batch_size,
+                client=client,
+            )
+        except Exception as e:
+            print(f"[error] {source} → {tgt}: {e}")
+            continue
+        if out is None:
+            print(f"[skip] {source} → {tgt}: no stored answers for {cfg.tested_model} (run run_eval.py first)")
+            continue
+        metrics, preds_path, metrics_path = out
+        print(f"[ok] {source} → {tgt}: {metrics} | preds={preds_path} | metrics={metrics_path}")
+
+
+def rejudge_target(
+    df,
+    artifacts_dir: str,
+    source: str,
+    target: str,
+    tested_model: str,
+    judge_model: str,
+    judge_prompt: str | None,
+    workers: int,
+    batch_size: int,
+    client,
+    pairs=None,
+    progress=None,
+):
+    """
+    Judge stored answers for one target; writes {target}_predictions.{tag}.csv and
+    {target}_metrics.{tag}.json. Returns (metrics, preds_path, metrics_path), or None
+    when there are no stored answers.
+    """
+    from eval import load_answers, run_judge_stage, judge_tag
+    from metrics import compute_metrics
+
+    answers = load_answers(artifacts_dir, source, target, tested_model)
+    if answers.empty:
+        return None
+
+    tag = judge_tag(judge_model, judge_prompt)
+    preds_path = os.path.join(artifacts_dir, f"{target}_predictions.{tag}.csv")
+    preds = run_judge_stage(
+        df=df,
+        answers=answers,
+        source_lang=source,
+        target_lang=target,
+        tested_model=tested_model,
+        judge_model=judge_model,
+        outdir=artifacts_dir,
+        judge_prompt=judge_prompt,
+        workers=workers,
+        batch_size=batch_size,
+        predictions_path=preds_path,
+        client=client,
+        pairs=pairs,
+        progress=progress,
+    )
+
+    metrics = compute_metrics(preds)
+    metrics_path = os.path.join(artifacts_dir, f"{target}_metrics.{tag}.json")
+    with open(metrics_path, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
+    return metrics, preds_path, metrics_path
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,23 @@ from __future__ import annotations
 import argparse
 import os
 import json
-from io_utils import load_config, load_long_csv
-from eval import run_pairwise_eval
-from metrics import compute_metrics
+import sys
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--config", required=True, help="Path to config.yaml")
+    ap.add_argument("--daemon", action="store_true", help="Submit the job to a running eval daemon (see daemon.py)")
     args = ap.parse_args()
 
+    if args.daemon:
+        from daemon_client import submit, print_events
+        sys.exit(0 if print_events(submit("eval", config=os.path.abspath(args.config))) else 1)
+
+    # Imported here so --daemon does not pay for pandas
+    from io_utils import load_config, load_long_csv, load_judge_prompt
+    from eval import run_pairwise_eval
+    from metrics import compute_metrics
+
     cfg = load_config(args.config)
     df = load_long_csv(cfg.csv_path, cfg.max_examples)
 
@@ -29,6 +37,9 @@ def main():
         temperature=cfg.temperature,
         max_tokens=cfg.max_tokens,
         outdir=cfg.artifacts_dir,
+        judge_prompt=load_judge_prompt(cfg.judge_prompt_path),
+        judge_workers=cfg.judge_workers,
+        judge_batch_size=cfg.judge_batch_size,
     )
     # Note: run_pairwise_eval() is resumable — it skips any q_id already completed in previous runs,
     # so preds may contain both previously saved and newly generated results.
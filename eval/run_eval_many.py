@@ -3,22 +3,28 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
 import os
 import json
-
-from io_utils import load_config, load_long_csv
-from eval import run_pairwise_eval
-from metrics import compute_metrics
+import sys
 
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Run pairwise eval for many target_langs concurrently (from YAML).")
     p.add_argument("--config", required=True, help="Path to config.yaml")
     p.add_argument("--workers", type=int, default=None, help="Max concurrent targets (default=min(4, len(targets)))")
+    p.add_argument("--daemon", action="store_true", help="Submit the job to a running eval daemon (see daemon.py)")
     return p.parse_args()
 
 
 def main():
     args = parse_args()
 
+    if args.daemon:
+        from daemon_client import submit, print_events
+        events = submit("eval", config=os.path.abspath(args.config), workers=args.workers)
+        sys.exit(0 if print_events(events) else 1)
+
+    # Imported here so --daemon does not pay for pandas
+    from io_utils import load_config, load_long_csv, load_judge_prompt
+
     cfg = load_config(args.config)
     df = load_long_csv(cfg.csv_path, cfg.max_examples)
 
@@ -31,6 +37,7 @@ def main():
         targets = [single]
 
     source = cfg.source_lang
+    judge_prompt = load_judge_prompt(cfg.judge_prompt_path)
     workers = args.workers or min(4, len(targets))
     os.makedirs(cfg.artifacts_dir, exist_ok=True)
 
@@ -53,6 +60,9 @@ def main():
                 temperature=cfg.temperature,
                 max_tokens=cfg.max_tokens,
                 outdir=cfg.artifacts_dir,
+                judge_prompt=judge_prompt,
+                judge_workers=cfg.judge_workers,
+                judge_batch_size=cfg.judge_batch_size,
             )] = tgt
 
         # Collect results
@@ -76,7 +86,13 @@ def _run_one_target(
     temperature: float,
     max_tokens: int,
     outdir: str,
+    judge_prompt: str | None,
+    judge_workers: int,
+    judge_batch_size: int,
 ):
+    from eval import run_pairwise_eval
+    from metrics import compute_metrics
+
     # Informative log for same-language runs (source == target)
     if source == target:
         print(f"[info] Same-language eval: {source} → {target}. Reusing source answers/judgments for target.")
@@ -90,6 +106,9 @@ def _run_one_target(
         temperature=temperature,
         max_tokens=max_tokens,
         outdir=outdir,
+        judge_prompt=judge_prompt,
+        judge_workers=judge_workers,
+        judge_batch_size=judge_batch_size,
     )
 
     # Resumable note: preds may include previously saved + newly generated rows